@@ -3,12 +3,14 @@ import asyncio
 import logging
 import os
 import json
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from typing import Optional, List, Dict, Any, Union
 
 # Import project-specific components
 from taskmaster.container import get_container, TaskmasterContainer
 from taskmaster.command_handler import TaskmasterCommandHandler, TaskmasterCommand
+from taskmaster.session_manager import SessionManager
 from taskmaster.schemas import create_flexible_response, validate_request, extract_guidance
 from taskmaster.exceptions import TaskmasterError
 
@@ -16,13 +18,23 @@ from taskmaster.exceptions import TaskmasterError
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create the FastMCP server
-# CORS is enabled by default for streamable-http transport
-mcp = FastMCP("Taskmaster")
-
 # Global container - initialize once
 container: Optional[TaskmasterContainer] = None
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Write session saves still pending when the server stops, on the server's own loop."""
+    try:
+        yield
+    finally:
+        # Only flush here: the container outlives a single lifespan, so it is not disposed
+        if container is not None:
+            await container.resolve(SessionManager).close()
+
+# Create the FastMCP server
+# CORS is enabled by default for streamable-http transport
+mcp = FastMCP("Taskmaster", lifespan=lifespan)
+
 def preprocess_mcp_parameters(**kwargs) -> Dict[str, Any]:
     """
     Preprocess MCP parameters to handle serialization issues.
@@ -6,19 +6,67 @@ persistence with proper error handling and resource cleanup.
 """
 
 import asyncio
-import json
+import errno
+import hashlib
 import logging
 import os
+import shutil
+import weakref
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List, AsyncContextManager
+from typing import Dict, Any, Optional, List, Tuple, AsyncContextManager
 from contextlib import asynccontextmanager
 import aiofiles
 import aiofiles.os
+from pydantic import TypeAdapter
 from .models import Session
 from .exceptions import TaskmasterError, ErrorCode, SessionError
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; backups fall back to a byte copy
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: backups are stored as plain JSON without it
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on files read concurrently when scanning the storage directory
+MAX_CONCURRENT_FILE_READS = 32
+
+# Number of parsed files remembered for read-only integrity/statistics checks
+PARSE_CACHE_SIZE = 256
+
+# Compression level for zstd backups; level 3 compresses JSON well at low CPU cost
+BACKUP_COMPRESSION_LEVEL = 3
+
+# Leading bytes of a zstd frame, used to recognise compressed files on read
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Linux ioctl that shares a file's extents copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# FICLONE errors meaning the storage directory cannot reflink at all
+_REFLINK_UNSUPPORTED_ERRNOS = frozenset({errno.ENOTTY, errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL})
+
+# Serializes sessions straight to JSON bytes
+_SESSION_ADAPTER = TypeAdapter(Session)
+
+
+def serialize_session(session: Session) -> bytes:
+    """Serialize a session to the indented UTF-8 JSON bytes written to its file."""
+    # dump_json returns bytes directly; model_dump_json(...).encode() would hold the
+    # document twice (str, then its bytes copy)
+    return _SESSION_ADAPTER.dump_json(session, indent=2)
+
+
+def session_content_digest(session_json: bytes) -> bytes:
+    """Fingerprint serialized session content for change detection."""
+    return hashlib.blake2b(session_json, digest_size=16).digest()
+
 
 class AsyncSessionPersistence:
     """
@@ -28,72 +76,131 @@ class AsyncSessionPersistence:
     and proper resource cleanup for robust session persistence.
     """
     
-    def __init__(self, storage_directory: Path, backup_count: int = 5):
+    def __init__(
+        self,
+        storage_directory: Path,
+        backup_count: int = 5,
+        compress_backups: bool = False,
+        durable_writes: bool = False
+    ):
         """
         Initialize the async session persistence manager.
         
         Args:
             storage_directory: Directory for session storage
             backup_count: Number of backup files to maintain
+            compress_backups: Store backups zstd-compressed (requires the zstandard package)
+            durable_writes: fsync session files after writing so saves survive power loss
         """
         self.storage_directory = Path(storage_directory)
+        # Plain string form for building file paths without a Path allocation per call
+        self._dir_str = str(self.storage_directory)
         self.backup_count = backup_count
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._lock_for_locks = asyncio.Lock()
+        if compress_backups and zstandard is None:
+            logger.warning("zstandard is not installed; backups will be stored uncompressed")
+            compress_backups = False
+        self.compress_backups = compress_backups
+        self.durable_writes = durable_writes
+        # Locks are dropped automatically once no coroutine holds them
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # Parsed files keyed by (path, mtime_ns, size) so unchanged files are not re-parsed
+        self._parse_cache: "OrderedDict[Tuple[str, int, int], Optional[Session]]" = OrderedDict()
+        # Background rewrites of main files recovered from a backup, by session ID
+        self._pending_restores: Dict[str, asyncio.Task] = {}
+        # Cleared after the first FICLONE the filesystem rejects; backups then copy directly
+        self._reflink_supported = fcntl is not None
         
         # Ensure storage directory exists
         self.storage_directory.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"AsyncSessionPersistence initialized with directory: {storage_directory}")
     
-    async def _get_session_lock(self, session_id: str) -> asyncio.Lock:
+    def _get_session_lock(self, session_id: str) -> asyncio.Lock:
         """Get or create a lock for a specific session."""
-        async with self._lock_for_locks:
-            if session_id not in self._locks:
-                self._locks[session_id] = asyncio.Lock()
-            return self._locks[session_id]
+        # No await between lookup and insert, so this is safe on the event loop
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
     
-    def _get_session_file_path(self, session_id: str) -> Path:
+    def _get_session_file_path(self, session_id: str) -> str:
         """Get the file path for a session."""
-        return self.storage_directory / f"{session_id}.json"
+        return os.path.join(self._dir_str, f"{session_id}.json")
     
-    def _get_backup_file_path(self, session_id: str, backup_index: int) -> Path:
+    def _get_backup_file_path(self, session_id: str, backup_index: int) -> str:
         """Get the backup file path for a session."""
-        return self.storage_directory / f"{session_id}.backup.{backup_index}.json"
+        return os.path.join(self._dir_str, f"{session_id}.backup.{backup_index}.json")
     
-    def _get_temp_file_path(self, session_id: str) -> Path:
+    def _get_temp_file_path(self, session_id: str) -> str:
         """Get the temporary file path for atomic writes."""
-        return self.storage_directory / f"{session_id}.tmp.json"    
-    async def save_session(self, session: Session) -> None:
+        return os.path.join(self._dir_str, f"{session_id}.tmp.json")
+    
+    @staticmethod
+    def _storage_file_kind(file_name: str) -> str:
+        """Classify a storage file name as 'session', 'backup' or 'temp'."""
+        if file_name.endswith(".tmp.json"):
+            return "temp"
+        if ".backup." in file_name:
+            return "backup"
+        return "session"
+    
+    def _scan_storage_sync(self) -> List[os.DirEntry]:
+        """List JSON files in the storage directory with a single directory read (run in a worker thread)."""
+        with os.scandir(self.storage_directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+    
+    async def save_session(self, session: Session, session_json: Optional[bytes] = None) -> None:
         """
         Save a session to disk with atomic write and backup management.
         
         Args:
             session: The session to save
+            session_json: serialize_session(session) output, if the caller already has it
         
         Raises:
             SessionError: If saving fails
         """
-        session_lock = await self._get_session_lock(session.id)
+        async with self._get_session_lock(session.id):
+            await self._save_session_locked(session, session_json)
+    
+    async def _save_session_locked(self, session: Session, session_json: Optional[bytes] = None) -> None:
+        """Save a session; the caller must hold the session lock."""
+        try:
+            # This write supersedes any restore still waiting for the lock
+            self._cancel_pending_restore(session.id)
+            
+            # Snapshot on the event loop; the worker thread only does file I/O
+            if session_json is None:
+                session_json = serialize_session(session)
+            
+            # Back up the current file and write the new one in a single
+            # worker-thread call instead of one thread-pool hop per syscall
+            await asyncio.to_thread(self._save_session_sync, session.id, session_json)
+            
+            logger.debug(f"Session saved: {session.id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save session {session.id}: {e}")
+            raise SessionError(
+                message=f"Failed to save session: {str(e)}",
+                session_id=session.id,
+                error_code=ErrorCode.SESSION_PERSISTENCE_FAILED,
+                cause=e
+            )
+    
+    async def get_session_file_signature(self, session_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the (mtime_ns, size) of a session file, or None if it does not exist.
         
-        async with session_lock:
-            try:
-                # Create backup if session file exists
-                await self._create_backup(session.id)
-                
-                # Perform atomic write
-                await self._atomic_write_session(session)
-                
-                logger.debug(f"Session saved: {session.id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to save session {session.id}: {e}")
-                raise SessionError(
-                    message=f"Failed to save session: {str(e)}",
-                    session_id=session.id,
-                    error_code=ErrorCode.SESSION_PERSISTENCE_FAILED,
-                    cause=e
-                )
+        Comparing signatures tells a caller whether the file was rewritten,
+        restored or deleted since it last looked.
+        """
+        try:
+            file_stat = await aiofiles.os.stat(self._get_session_file_path(session_id))
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
     
     async def load_session(self, session_id: str) -> Optional[Session]:
         """
@@ -108,38 +215,39 @@ class AsyncSessionPersistence:
         Raises:
             SessionError: If loading fails
         """
-        session_lock = await self._get_session_lock(session_id)
-        
-        async with session_lock:
-            try:
-                # Try to load main session file
-                session_file = self._get_session_file_path(session_id)
-                
-                if await aiofiles.os.path.exists(session_file):
-                    session = await self._load_session_from_file(session_file)
-                    if session:
-                        logger.debug(f"Session loaded: {session_id}")
-                        return session
-                
-                # Try to load from backups
-                session = await self._load_from_backups(session_id)
-                if session:
-                    logger.info(f"Session loaded from backup: {session_id}")
-                    # Restore the session to main file
-                    await self._atomic_write_session(session)
-                    return session
-                
-                logger.debug(f"Session not found: {session_id}")
-                return None
-                
-            except Exception as e:
-                logger.error(f"Failed to load session {session_id}: {e}")
-                raise SessionError(
-                    message=f"Failed to load session: {str(e)}",
-                    session_id=session_id,
-                    error_code=ErrorCode.SESSION_PERSISTENCE_FAILED,
-                    cause=e
-                )    
+        async with self._get_session_lock(session_id):
+            return await self._load_session_locked(session_id)
+    
+    async def _load_session_locked(self, session_id: str) -> Optional[Session]:
+        """Load a session; the caller must hold the session lock."""
+        try:
+            # Try to load main session file
+            session_file = self._get_session_file_path(session_id)
+            
+            session = await self._load_session_from_file(session_file)
+            if session:
+                logger.debug(f"Session loaded: {session_id}")
+                return session
+            
+            # Try to load from backups
+            session = await self._load_from_backups(session_id)
+            if session:
+                logger.info(f"Session loaded from backup: {session_id}")
+                # Restore the session to main file without making the caller wait
+                self._schedule_restore(session)
+                return session
+            
+            logger.debug(f"Session not found: {session_id}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Failed to load session {session_id}: {e}")
+            raise SessionError(
+                message=f"Failed to load session: {str(e)}",
+                session_id=session_id,
+                error_code=ErrorCode.SESSION_PERSISTENCE_FAILED,
+                cause=e
+            )    
     async def delete_session(self, session_id: str) -> bool:
         """
         Delete a session and its backups.
@@ -150,29 +258,14 @@ class AsyncSessionPersistence:
         Returns:
             bool: True if deleted, False if not found
         """
-        session_lock = await self._get_session_lock(session_id)
+        session_lock = self._get_session_lock(session_id)
         
         async with session_lock:
             try:
-                deleted = False
-                
-                # Delete main session file
-                session_file = self._get_session_file_path(session_id)
-                if await aiofiles.os.path.exists(session_file):
-                    await aiofiles.os.remove(session_file)
-                    deleted = True
+                self._cancel_pending_restore(session_id)
                 
-                # Delete backup files
-                for i in range(self.backup_count):
-                    backup_file = self._get_backup_file_path(session_id, i)
-                    if await aiofiles.os.path.exists(backup_file):
-                        await aiofiles.os.remove(backup_file)
-                        deleted = True
-                
-                # Delete temp file if it exists
-                temp_file = self._get_temp_file_path(session_id)
-                if await aiofiles.os.path.exists(temp_file):
-                    await aiofiles.os.remove(temp_file)
+                # Remove every file in one worker-thread call
+                deleted = await asyncio.to_thread(self._delete_session_files_sync, session_id)
                 
                 if deleted:
                     logger.info(f"Session deleted: {session_id}")
@@ -195,49 +288,52 @@ class AsyncSessionPersistence:
             List of session metadata dictionaries
         """
         try:
-            sessions = []
+            # Scan for session files, skipping backup slots and temp files
+            entries = await asyncio.to_thread(self._scan_storage_sync)
+            session_entries = [
+                entry for entry in entries if self._storage_file_kind(entry.name) == "session"
+            ]
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILE_READS)
             
-            # Scan for session files
-            for file_path in self.storage_directory.glob("*.json"):
-                if file_path.name.endswith(".backup.json") or file_path.name.endswith(".tmp.json"):
-                    continue
-                
-                session_id = file_path.stem
+            async def read_session_info(entry: os.DirEntry) -> Dict[str, Any]:
+                session_id = entry.name[:-len(".json")]
+                file_path = entry.path
                 
-                try:
-                    # Get file stats
-                    stat = await aiofiles.os.stat(file_path)
-                    
-                    # Try to load session for additional metadata
-                    session = await self._load_session_from_file(file_path)
-                    
-                    session_info = {
-                        "id": session_id,
-                        "file_path": str(file_path),
-                        "size": stat.st_size,
-                        "modified": stat.st_mtime,
-                        "name": getattr(session, 'session_name', None) if session else None,
-                        "task_count": len(session.tasks) if session else 0,
-                        "valid": session is not None
-                    }
-                    
-                    sessions.append(session_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error reading session file {file_path}: {e}")
-                    # Include invalid sessions in the list
-                    sessions.append({
-                        "id": session_id,
-                        "file_path": str(file_path),
-                        "size": 0,
-                        "modified": 0,
-                        "name": None,
-                        "task_count": 0,
-                        "valid": False,
-                        "error": str(e)
-                    })
+                async with semaphore:
+                    try:
+                        # Stat and read through one open descriptor in a single thread hop
+                        stat, content = await asyncio.to_thread(self._open_and_stat_sync, file_path)
+                        
+                        # Validate against the Session model; unchanged files reuse the
+                        # parse cached by earlier listings and storage statistics
+                        session = await self._load_session_cached(file_path, stat, content)
+                        
+                        return {
+                            "id": session_id,
+                            "file_path": file_path,
+                            "size": stat.st_size,
+                            "modified": stat.st_mtime,
+                            "name": session.name if session else None,
+                            "task_count": len(session.tasks) if session else 0,
+                            "valid": session is not None
+                        }
+                        
+                    except Exception as e:
+                        logger.warning(f"Error reading session file {file_path}: {e}")
+                        # Include invalid sessions in the list
+                        return {
+                            "id": session_id,
+                            "file_path": file_path,
+                            "size": 0,
+                            "modified": 0,
+                            "name": None,
+                            "task_count": 0,
+                            "valid": False,
+                            "error": str(e)
+                        }
             
-            return sessions
+            # Stat and parse files concurrently, bounded to avoid fd exhaustion
+            return list(await asyncio.gather(*(read_session_info(e) for e in session_entries)))
             
         except Exception as e:
             logger.error(f"Failed to list sessions: {e}")
@@ -246,74 +342,218 @@ class AsyncSessionPersistence:
                 error_code=ErrorCode.SESSION_PERSISTENCE_FAILED,
                 cause=e
             )    
-    async def _atomic_write_session(self, session: Session) -> None:
-        """Perform simple write of session data."""
-        session_file = self._get_session_file_path(session.id)
+    def _schedule_restore(self, session: Session) -> None:
+        """Rewrite a session's main file from a recovered copy in a background task."""
+        # The snapshot is taken now so later mutations by the caller are not written
+        session_json = serialize_session(session)
+        
+        self._cancel_pending_restore(session.id)
+        task = asyncio.create_task(self._restore_session_file(session.id, session_json))
+        self._pending_restores[session.id] = task
         
+        def forget(done: asyncio.Task) -> None:
+            if self._pending_restores.get(session.id) is done:
+                del self._pending_restores[session.id]
+        
+        task.add_done_callback(forget)
+    
+    def _cancel_pending_restore(self, session_id: str) -> None:
+        """Drop a queued restore; the caller must hold the session lock."""
+        # While the caller holds the lock the restore can only be waiting for it,
+        # so cancelling never interrupts a write in progress
+        task = self._pending_restores.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+    
+    async def _restore_session_file(self, session_id: str, session_json: bytes) -> None:
+        """Write a recovered session back to its main file under the session lock."""
         try:
-            # Simple direct write - no temp files, no atomic operations
-            async with aiofiles.open(session_file, 'w') as f:
-                # Use Pydantic's model_dump with mode='json' to handle datetime serialization
-                session_data = session.model_dump(mode='json')
-                await f.write(json.dumps(session_data, indent=2))
-                await f.flush()
-                
+            async with self._get_session_lock(session_id):
+                # Simple direct write - no temp files, no atomic operations
+                await asyncio.to_thread(
+                    self._write_file_sync,
+                    self._get_session_file_path(session_id),
+                    session_json,
+                    self.durable_writes
+                )
         except Exception as e:
-            raise e
+            logger.warning(f"Failed to restore session file for {session_id}: {e}")
+    
+    @staticmethod
+    def _write_file_sync(file_path: str, content: bytes, durable: bool = False) -> None:
+        """Write serialized session content to disk (run in a worker thread)."""
+        with open(file_path, 'wb') as f:
+            f.write(content)
+            if durable:
+                # close() only flushes to the OS; fsync waits for the device
+                f.flush()
+                os.fsync(f.fileno())
     
-    async def _create_backup(self, session_id: str) -> None:
+    def _delete_session_files_sync(self, session_id: str) -> bool:
+        """Remove a session's main, backup and temp files; True if main or backups existed."""
+        deleted = False
+        paths = [self._get_session_file_path(session_id)]
+        paths.extend(self._get_backup_file_path(session_id, i) for i in range(self.backup_count))
+        
+        for path in paths:
+            try:
+                os.remove(path)
+                deleted = True
+            except FileNotFoundError:
+                pass
+        
+        # The temp file does not count towards "deleted"
+        try:
+            os.remove(self._get_temp_file_path(session_id))
+        except FileNotFoundError:
+            pass
+        
+        return deleted
+    
+    def _save_session_sync(self, session_id: str, session_json: bytes) -> None:
+        """Back up and write a session file using blocking calls (run in a worker thread)."""
+        try:
+            self._create_backup_sync(session_id)
+        except Exception as e:
+            logger.warning(f"Failed to create backup for session {session_id}: {e}")
+            # Don't fail the main operation if backup fails
+        
+        self._write_file_sync(self._get_session_file_path(session_id), session_json, self.durable_writes)
+    
+    def _create_backup_sync(self, session_id: str) -> None:
         """Create a backup of the current session file."""
         session_file = self._get_session_file_path(session_id)
         
-        if not await aiofiles.os.path.exists(session_file):
+        if not os.path.exists(session_file):
             return
         
+        # Rotate existing backups
+        self._rotate_backups_sync(session_id)
+        
+        backup_file = self._get_backup_file_path(session_id, 0)
+        if self.compress_backups:
+            with open(session_file, 'rb') as f:
+                content = f.read()
+            compressor = zstandard.ZstdCompressor(level=BACKUP_COMPRESSION_LEVEL)
+            with open(backup_file, 'wb') as f:
+                f.write(compressor.compress(content))
+        else:
+            self._clone_or_copy_sync(session_file, backup_file)
+    
+    def _clone_or_copy_sync(self, source: str, destination: str) -> None:
+        """Reflink source to destination when the filesystem allows it, else copy the bytes."""
+        if self._reflink_supported:
+            try:
+                with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError as e:
+                if e.errno in _REFLINK_UNSUPPORTED_ERRNOS:
+                    # ext4, tmpfs, overlayfs...: stop trying for this storage directory
+                    self._reflink_supported = False
+                    logger.debug(f"Reflink not supported in {self._dir_str}; backups will be copied")
+        
+        # shutil.copyfile uses os.sendfile on Linux
+        shutil.copyfile(source, destination)
+    
+    def _rotate_backups_sync(self, session_id: str) -> None:
+        """Shift backup slots up by one using blocking calls (run in a worker thread)."""
+        for i in range(self.backup_count - 1, 0, -1):
+            try:
+                # os.replace overwrites the destination slot on all platforms
+                os.replace(
+                    self._get_backup_file_path(session_id, i - 1),
+                    self._get_backup_file_path(session_id, i)
+                )
+            except FileNotFoundError:
+                continue    
+    async def _load_session_from_file(self, file_path: str) -> Optional[Session]:
+        """Load session from a specific file."""
         try:
-            # Rotate existing backups
-            for i in range(self.backup_count - 1, 0, -1):
-                old_backup = self._get_backup_file_path(session_id, i - 1)
-                new_backup = self._get_backup_file_path(session_id, i)
-                
-                if await aiofiles.os.path.exists(old_backup):
-                    if await aiofiles.os.path.exists(new_backup):
-                        await aiofiles.os.remove(new_backup)
-                    await aiofiles.os.rename(old_backup, new_backup)
-            
-            # Create new backup from current file
-            backup_file = self._get_backup_file_path(session_id, 0)
-            if await aiofiles.os.path.exists(backup_file):
-                await aiofiles.os.remove(backup_file)
-            
-            # Copy current file to backup
-            async with aiofiles.open(session_file, 'rb') as src:
-                async with aiofiles.open(backup_file, 'wb') as dst:
-                    async for chunk in src:
-                        await dst.write(chunk)
-                        
+            content = await asyncio.to_thread(self._read_bytes_sync, file_path)
         except Exception as e:
-            logger.warning(f"Failed to create backup for session {session_id}: {e}")
-            # Don't fail the main operation if backup fails    
-    async def _load_session_from_file(self, file_path: Path) -> Optional[Session]:
-        """Load session from a specific file."""
+            logger.warning(f"Failed to load session from {file_path}: {e}")
+            return None
+        if content is None:
+            return None
+        return self._parse_session(file_path, content)
+    
+    @staticmethod
+    def _parse_session(file_path: str, content: bytes) -> Optional[Session]:
+        """Parse and validate session bytes in a single pass without an intermediate dict."""
         try:
-            async with aiofiles.open(file_path, 'r') as f:
-                content = await f.read()
-                session_data = json.loads(content)
-                return Session(**session_data)
+            if content.startswith(ZSTD_MAGIC):
+                if zstandard is None:
+                    raise RuntimeError("file is zstd-compressed but zstandard is not installed")
+                content = zstandard.ZstdDecompressor().decompress(content)
+            return Session.model_validate_json(content)
         except Exception as e:
             logger.warning(f"Failed to load session from {file_path}: {e}")
             return None
     
+    @staticmethod
+    def _read_bytes_sync(file_path: str) -> Optional[bytes]:
+        """Read a whole file in one worker-thread call, returning None if it is missing."""
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    @staticmethod
+    def _open_and_stat_sync(file_path: str) -> Tuple[os.stat_result, bytes]:
+        """Open a file once and return its fstat result and contents (run in a worker thread)."""
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            file_stat = os.fstat(fd)
+            # Size reads from fstat; keep reading until EOF in case the file grew
+            chunks = []
+            while chunk := os.read(fd, file_stat.st_size + 1):
+                chunks.append(chunk)
+            return file_stat, b"".join(chunks)
+        finally:
+            os.close(fd)
+    
+    async def _load_session_cached(
+        self,
+        file_path: str,
+        file_stat: Optional[os.stat_result] = None,
+        content: Optional[bytes] = None
+    ) -> Optional[Session]:
+        """
+        Load a session for read-only checks, reusing the parse of an unchanged file.
+        
+        The returned instance may be shared between callers and must not be mutated.
+        """
+        try:
+            if file_stat is None:
+                file_stat = await aiofiles.os.stat(file_path)
+        except OSError:
+            return None
+        
+        cache_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        if cache_key in self._parse_cache:
+            self._parse_cache.move_to_end(cache_key)
+            return self._parse_cache[cache_key]
+        
+        if content is not None:
+            session = self._parse_session(file_path, content)
+        else:
+            session = await self._load_session_from_file(file_path)
+        self._parse_cache[cache_key] = session
+        if len(self._parse_cache) > PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        return session
+    
     async def _load_from_backups(self, session_id: str) -> Optional[Session]:
         """Try to load session from backup files."""
         for i in range(self.backup_count):
             backup_file = self._get_backup_file_path(session_id, i)
             
-            if await aiofiles.os.path.exists(backup_file):
-                session = await self._load_session_from_file(backup_file)
-                if session:
-                    logger.info(f"Loaded session {session_id} from backup {i}")
-                    return session
+            session = await self._load_session_from_file(backup_file)
+            if session:
+                logger.info(f"Loaded session {session_id} from backup {i}")
+                return session
         
         return None
     
@@ -327,7 +567,10 @@ class AsyncSessionPersistence:
         try:
             cleaned_count = 0
             
-            for temp_file in self.storage_directory.glob("*.tmp.json"):
+            entries = await asyncio.to_thread(self._scan_storage_sync)
+            temp_files = [entry.path for entry in entries if self._storage_file_kind(entry.name) == "temp"]
+            
+            for temp_file in temp_files:
                 try:
                     await aiofiles.os.remove(temp_file)
                     cleaned_count += 1
@@ -366,7 +609,7 @@ class AsyncSessionPersistence:
             # Check main file
             session_file = self._get_session_file_path(session_id)
             if await aiofiles.os.path.exists(session_file):
-                session = await self._load_session_from_file(session_file)
+                session = await self._load_session_cached(session_file)
                 result["main_file_valid"] = session is not None
                 if not session:
                     result["errors"].append("Main session file is corrupted")
@@ -378,12 +621,12 @@ class AsyncSessionPersistence:
                 backup_file = self._get_backup_file_path(session_id, i)
                 if await aiofiles.os.path.exists(backup_file):
                     result["total_backups"] += 1
-                    session = await self._load_session_from_file(backup_file)
+                    session = await self._load_session_cached(backup_file)
                     is_valid = session is not None
                     result["backup_files_valid"].append({
                         "index": i,
                         "valid": is_valid,
-                        "file_path": str(backup_file)
+                        "file_path": backup_file
                     })
                     if is_valid:
                         result["valid_backups"] += 1
@@ -413,18 +656,22 @@ class AsyncSessionPersistence:
         Yields:
             Session instance or None if not found
         """
-        session_lock = await self._get_session_lock(session_id)
+        session_lock = self._get_session_lock(session_id)
         
         async with session_lock:
-            # Load session
-            session = await self.load_session(session_id)
+            # Load session (the lock is already held, so use the locked variants)
+            session = await self._load_session_locked(session_id)
+            original_digest = session_content_digest(serialize_session(session)) if session else None
             
             try:
                 yield session
                 
-                # Save session if it was modified
+                # Save session only if it was modified; read-only transactions
+                # would otherwise rewrite the file and rotate a backup
                 if session:
-                    await self.save_session(session)
+                    session_json = serialize_session(session)
+                    if session_content_digest(session_json) != original_digest:
+                        await self._save_session_locked(session, session_json)
                     
             except Exception as e:
                 logger.error(f"Transaction failed for session {session_id}: {e}")
@@ -448,24 +695,41 @@ class AsyncSessionPersistence:
                 "corrupted_sessions": 0
             }
             
-            # Count different file types
-            for file_path in self.storage_directory.glob("*.json"):
-                file_stat = await aiofiles.os.stat(file_path)
-                stats["total_size"] += file_stat.st_size
-                
-                if file_path.name.endswith(".tmp.json"):
-                    stats["total_temp_files"] += 1
-                elif ".backup." in file_path.name:
-                    stats["total_backups"] += 1
+            entries = await asyncio.to_thread(self._scan_storage_sync)
+            session_files = []
+            auxiliary_entries = []
+            for entry in entries:
+                kind = self._storage_file_kind(entry.name)
+                if kind == "session":
+                    session_files.append(entry.path)
                 else:
+                    auxiliary_entries.append(entry)
+                    stats["total_backups" if kind == "backup" else "total_temp_files"] += 1
+            
+            # Backups and temp files only need their size: stat them all in one thread hop
+            auxiliary_sizes = await asyncio.to_thread(
+                lambda: [entry.stat().st_size for entry in auxiliary_entries]
+            )
+            stats["total_size"] += sum(auxiliary_sizes)
+            
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILE_READS)
+            
+            async def inspect_session_file(file_path: str) -> None:
+                async with semaphore:
+                    # Stat and read through one open descriptor in a single thread hop
+                    file_stat, content = await asyncio.to_thread(self._open_and_stat_sync, file_path)
+                    stats["total_size"] += file_stat.st_size
                     stats["total_sessions"] += 1
                     # Check if session is valid
-                    session = await self._load_session_from_file(file_path)
+                    session = await self._load_session_cached(file_path, file_stat, content)
                     if session:
                         stats["valid_sessions"] += 1
                     else:
                         stats["corrupted_sessions"] += 1
             
+            # Validate session files concurrently
+            await asyncio.gather(*(inspect_session_file(p) for p in session_files))
+            
             return stats
             
         except Exception as e:
@@ -477,12 +741,16 @@ class AsyncSessionPersistence:
     async def dispose(self) -> None:
         """Clean up resources and perform final cleanup."""
         try:
+            # Let background restores finish before their files are cleaned up
+            if self._pending_restores:
+                await asyncio.gather(*self._pending_restores.values(), return_exceptions=True)
+            
             # Clean up temporary files
             await self.cleanup_temp_files()
             
-            # Clear locks
-            async with self._lock_for_locks:
-                self._locks.clear()
+            # Clear locks and cached parses
+            self._locks.clear()
+            self._parse_cache.clear()
             
             logger.info("AsyncSessionPersistence disposed")
             
@@ -1,10 +1,14 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+import asyncio
 import logging
 import json
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
+from pydantic import TypeAdapter
 from .models import Session, Task
 from .session_manager import SessionManager
+from .workflow_state_machine import WorkflowEvent, WorkflowState
 from .schemas import (
     ActionType,
     create_flexible_request, create_flexible_response,
@@ -13,41 +17,201 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole tasklist in one call instead of constructing Task per item
+_TASK_LIST_ADAPTER = TypeAdapter(List[Task])
+
+# Guidance texts shared by every response of a handler
+_GUIDE_NO_SESSION = "No active session."
+
+_GUIDE_ALL_TASKS_DONE = "All tasks completed! Use 'end_session' to finish."
+
+_GUIDE_NO_SESSION_TO_END = "No active session to end."
+
+_GUIDE_COMMAND_NEEDS_SESSION = "❌ **ERROR**: No active session. Please start with 'create_session'."
+
+_GUIDE_CREATE_SESSION = """Session created. I've auto-assigned standard tools (read_file, edit_file, run_terminal_cmd, codebase_search).
+Call 'create_tasklist' to define your tasks."""
+
+_GUIDE_TASKLIST_FORMAT = """📋 CREATE TASKLIST - Required Format:
+
+✅ CORRECT FORMAT (JSON array with double quotes):
+[{"description": "Task 1 description"}, {"description": "Task 2 description"}]
+
+❌ AVOID THESE COMMON ERRORS:
+- Single quotes: [{'description': 'task'}]  ← WRONG
+- Missing quotes: [{description: "task"}]  ← WRONG  
+- Extra characters: [{"description": "task"},]  ← WRONG
+- Malformed JSON: [{"description": "task" "description": "task2"}]  ← WRONG
+
+💡 EXAMPLE:
+[{"description": "Set up project structure"}, {"description": "Implement authentication"}, {"description": "Add user management"}]"""
+
+_GUIDE_TASKLIST_JSON_FIXES = """🔧 COMMON FIXES:
+1. Use double quotes: "description" not 'description'
+2. Remove trailing commas: [{"desc": "task"}] not [{"desc": "task"},]
+3. Fix missing commas: [{"desc": "task"} {"desc": "task2"}] → [{"desc": "task"}, {"desc": "task2"}]
+4. Check brackets: [{"desc": "task"}] not [{"desc": "task"}]
+
+✅ CORRECT FORMAT:
+[{"description": "Your task description"}]"""
+
+# Filled in with str.format(session_name=..., task_count=...)
+_GUIDE_TASKLIST_CREATED = """✅ Tasklist created with {task_count} tasks.
+
+📋 WORKFLOW STATUS:
+- Session: {session_name}
+- Tasks: {task_count} total
+- Current: Task 1 of {task_count}
+
+▶️ NEXT STEP: Call 'execute_next' to start working on the first task."""
+
+# Filled in with str.format_map({"description", "position", "total"})
+_GUIDE_EXECUTE_TASK = """🎯 CURRENT TASK: {description}
+
+📊 PROGRESS: Task {position} of {total}
+
+🛠️ AVAILABLE TOOLS:
+- read_file: Read and examine files
+- edit_file: Modify code and files  
+- run_terminal_cmd: Execute commands
+- codebase_search: Find code patterns
+
+✅ WHEN DONE: Call 'mark_complete' to finish this task and move to the next one."""
+
+# Filled in with str.format_map({"description", "completed", "total"})
+_GUIDE_TASK_COMPLETED = """✅ TASK COMPLETED: {description}
+
+📊 PROGRESS: {completed}/{total} tasks done
+
+▶️ NEXT STEP: Call 'execute_next' to start the next task."""
+
+# Filled in with str.format_map({"session_name", "total"})
+_GUIDE_ALL_TASKS_COMPLETED = """🎉 ALL TASKS COMPLETED!
+
+📊 FINAL STATUS:
+- Session: {session_name}
+- Tasks completed: {total}/{total}
+- Status: Ready to finish
+
+🏁 FINAL STEP: Call 'end_session' to complete the workflow."""
+
+_GUIDE_STATUS_NO_SESSION = "❌ **No active session.** Use `create_session` to start."
+
+# Filled in with str.format(session_id=..., completed_tasks=..., total_tasks=..., workflow_state=...)
+_GUIDE_STATUS_HEADER = """
+📊 **SESSION STATUS**
+
+**Session ID**: {session_id}
+**Progress**: {completed_tasks}/{total_tasks} tasks completed
+**Current State**: {workflow_state}
+
+"""
+
+# Filled in with str.format(description=..., status=...)
+_GUIDE_STATUS_CURRENT_TASK = """**Current Task**: {description}
+**Status**: {status}
+
+"""
+
+# Filled in with str.format(context=...)
+_GUIDE_COLLABORATION = """
+🤝 **WORKFLOW PAUSED FOR USER COLLABORATION**
+
+The agent has requested help with the following context:
+> {context}
+
+**To Resume Workflow**:
+The user must provide feedback. The agent should then use the `edit_task` command to update the plan based on the user's response and then continue with `execute_next`.
+"""
+
+_GUIDE_EDIT_TASK_TEMPLATE = """
+🛠️ **EDIT TASK**
+
+Update a task based on user feedback or new requirements.
+
+**Example edit_task call:**
+```json
+{
+  "action": "edit_task",
+  "task_id": "task_123",
+  "updated_task_data": {
+    "description": "Updated task description",
+    "complexity_level": "complex"
+  }
+}
+```
+"""
+
+# Filled in with str.format(session_id=..., completed_tasks=..., total_tasks=..., ended_at=...)
+_GUIDE_END_SESSION = """
+🎉 **SESSION COMPLETED**
+
+**Final Summary:**
+- Session ID: {session_id}
+- Tasks Completed: {completed_tasks}/{total_tasks}
+- Session ended at: {ended_at}
+
+**Thank you for using Taskmaster!**
+"""
+
 
 class TaskmasterCommand:
     """Represents a command to be executed by the TaskmasterCommandHandler."""
     
+    __slots__ = (
+        "data", "action", "task_description", "session_name", "tasklist",
+        "collaboration_context", "task_id", "updated_task_data"
+    )
+
     def __init__(self, **kwargs):
         if "data" in kwargs:
-            merged_data = kwargs["data"].copy()
-            merged_data.update({k: v for k, v in kwargs.items() if k != "data"})
-            self.data = create_flexible_request(merged_data)
+            # kwargs is our own dict, so popping from it is safe; keywords win
+            data_part = kwargs.pop("data")
+            self.data = create_flexible_request({**data_part, **kwargs})
         else:
             self.data = create_flexible_request(kwargs)
-        
-        self.action = self.data.get("action", "get_status")
-        self.task_description = self.data.get("task_description")
-        self.session_name = self.data.get("session_name")
-        self.tasklist = self.data.get("tasklist", [])
-        self.collaboration_context = self.data.get("collaboration_context")
-        self.task_id = self.data.get("task_id")
-        self.updated_task_data = self.data.get("updated_task_data", {})
+
+        get = self.data.get
+        self.action = get("action", "get_status")
+        self.task_description = get("task_description")
+        self.session_name = get("session_name")
+        self.collaboration_context = get("collaboration_context")
+        self.task_id = get("task_id")
+        self.tasklist = get("tasklist", [])
+        self.updated_task_data = get("updated_task_data", {})
 
 
 class TaskmasterResponse:
     """Represents a response from the TaskmasterCommandHandler."""
     
+    __slots__ = (
+        "data", "action", "session_id", "status", "suggested_next_actions",
+        "completion_guidance"
+    )
+    
     def __init__(self, action: str, **kwargs):
         self.data = create_flexible_response(action, **kwargs)
-        self.action = self.data["action"]
-        self.session_id = self.data.get("session_id")
-        self.status = self.data.get("status", "success")
-        self.suggested_next_actions = self.data.get("suggested_next_actions", [])
-        self.completion_guidance = self.data.get("completion_guidance", "")
-        
-        for key, value in kwargs.items():
-            if not hasattr(self, key):
-                setattr(self, key, value)
+        data = self.data
+        # create_flexible_response always fills these keys with their defaults
+        self.action = data["action"]
+        self.session_id = data["session_id"]
+        self.status = data["status"]
+        self.completion_guidance = data["completion_guidance"]
+        # Only build the empty list when the handler suggested nothing
+        suggested = data.get("suggested_next_actions")
+        self.suggested_next_actions = [] if suggested is None else suggested
+    
+    def __getattr__(self, name: str) -> Any:
+        """Expose handler-specific response fields (e.g. tasks_created) stored in data."""
+        # Only reached when the slot lookup fails; never recurse for unset slots
+        if name.startswith("_") or name == "data":
+            raise AttributeError(name)
+        try:
+            return self.data[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert response to dictionary format."""
@@ -64,6 +228,10 @@ class BaseCommandHandler(ABC):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         """Handle the command and return a response."""
         pass
+    
+    def _schedule_update(self, session: Session) -> None:
+        """Persist the session in the background when the response does not depend on it."""
+        self.session_manager.schedule_update(session)
 
 
 class CreateSessionHandler(BaseCommandHandler):
@@ -74,14 +242,11 @@ class CreateSessionHandler(BaseCommandHandler):
         session.description = command.task_description or ""
         await self.session_manager.update_session(session)
         
-        guidance = """Session created. I've auto-assigned standard tools (read_file, edit_file, run_terminal_cmd, codebase_search).
-Call 'create_tasklist' to define your tasks."""
-        
         return TaskmasterResponse(
             action="create_session",
             session_id=session.id,
             suggested_next_actions=["create_tasklist"],
-            completion_guidance=guidance,
+            completion_guidance=_GUIDE_CREATE_SESSION,
         )
 
 
@@ -95,29 +260,16 @@ class CreateTasklistHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action="create_tasklist", status="guidance", completion_guidance="No active session.")
+            return TaskmasterResponse(action="create_tasklist", status="guidance", completion_guidance=_GUIDE_NO_SESSION)
 
         raw_tasklist = command.tasklist
 
         if not raw_tasklist:
-            guidance = """📋 CREATE TASKLIST - Required Format:
-
-✅ CORRECT FORMAT (JSON array with double quotes):
-[{"description": "Task 1 description"}, {"description": "Task 2 description"}]
-
-❌ AVOID THESE COMMON ERRORS:
-- Single quotes: [{'description': 'task'}]  ← WRONG
-- Missing quotes: [{description: "task"}]  ← WRONG  
-- Extra characters: [{"description": "task"},]  ← WRONG
-- Malformed JSON: [{"description": "task" "description": "task2"}]  ← WRONG
-
-💡 EXAMPLE:
-[{"description": "Set up project structure"}, {"description": "Implement authentication"}, {"description": "Add user management"}]"""
             return TaskmasterResponse(
                 action="create_tasklist",
                 session_id=session.id,
                 status="template",
-                completion_guidance=guidance,
+                completion_guidance=_GUIDE_TASKLIST_FORMAT,
                 suggested_next_actions=["create_tasklist"]
             )
 
@@ -128,21 +280,11 @@ class CreateTasklistHandler(BaseCommandHandler):
         # Handle case where tasklist is a JSON string
         if isinstance(raw_tasklist, str):
             try:
-                import json
                 raw_tasklist = json.loads(raw_tasklist)
                 logger.info(f"Parsed tasklist from JSON string: {raw_tasklist}")
             except (json.JSONDecodeError, TypeError) as e:
                 logger.error(f"Failed to parse tasklist JSON: {e}")
-                guidance = f"""❌ JSON PARSING ERROR: {e}
-
-🔧 COMMON FIXES:
-1. Use double quotes: "description" not 'description'
-2. Remove trailing commas: [{"desc": "task"}] not [{"desc": "task"},]
-3. Fix missing commas: [{"desc": "task"} {"desc": "task2"}] → [{"desc": "task"}, {"desc": "task2"}]
-4. Check brackets: [{"desc": "task"}] not [{"desc": "task"}]
-
-✅ CORRECT FORMAT:
-[{"description": "Your task description"}]"""
+                guidance = f"❌ JSON PARSING ERROR: {e}\n\n{_GUIDE_TASKLIST_JSON_FIXES}"
                 return TaskmasterResponse(
                     action="create_tasklist",
                     session_id=session.id,
@@ -151,25 +293,16 @@ class CreateTasklistHandler(BaseCommandHandler):
                     suggested_next_actions=["create_tasklist"]
                 )
         
-        tasks = []
-        for i, task in enumerate(raw_tasklist):
-            logger.info(f"Task {i}: type={type(task)}, content={task}")
-            if isinstance(task, dict):
-                description = task.get("description", f"Task {i+1}")
-            else:
-                description = str(task)
-            tasks.append(Task(description=description))
-        session.tasks = tasks
-        await self.session_manager.update_session(session)
+        session.tasks = _TASK_LIST_ADAPTER.validate_python([
+            {"description": task.get("description", f"Task {i+1}") if isinstance(task, dict) else str(task)}
+            for i, task in enumerate(raw_tasklist)
+        ])
+        # The response only reports the new tasks, so don't wait for the write
+        self._schedule_update(session)
         
-        guidance = f"""✅ Tasklist created with {len(session.tasks)} tasks.
-
-📋 WORKFLOW STATUS:
-- Session: {session.name}
-- Tasks: {len(session.tasks)} total
-- Current: Task 1 of {len(session.tasks)}
-
-▶️ NEXT STEP: Call 'execute_next' to start working on the first task."""
+        guidance = _GUIDE_TASKLIST_CREATED.format(
+            session_name=session.name, task_count=len(session.tasks)
+        )
         
         return TaskmasterResponse(
             action="create_tasklist",
@@ -188,11 +321,12 @@ class ExecuteNextHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session: 
-            return TaskmasterResponse(action="execute_next", status="guidance", completion_guidance="No active session.")
+            return TaskmasterResponse(action="execute_next", status="guidance", completion_guidance=_GUIDE_NO_SESSION)
             
         # Get current task based on index
-        if session.current_task_index >= len(session.tasks):
-            guidance = "All tasks completed! Use 'end_session' to finish."
+        current_task = session.get_current_task()
+        if current_task is None:
+            guidance = _GUIDE_ALL_TASKS_DONE
             return TaskmasterResponse(
                 action="execute_next",
                 status="completed",
@@ -200,19 +334,11 @@ class ExecuteNextHandler(BaseCommandHandler):
                 suggested_next_actions=["end_session"]
             )
 
-        current_task = session.tasks[session.current_task_index]
-        
-        guidance = f"""🎯 CURRENT TASK: {current_task.description}
-
-📊 PROGRESS: Task {session.current_task_index + 1} of {len(session.tasks)}
-
-🛠️ AVAILABLE TOOLS:
-- read_file: Read and examine files
-- edit_file: Modify code and files  
-- run_terminal_cmd: Execute commands
-- codebase_search: Find code patterns
-
-✅ WHEN DONE: Call 'mark_complete' to finish this task and move to the next one."""
+        guidance = _GUIDE_EXECUTE_TASK.format_map({
+            "description": current_task.description,
+            "position": session.current_task_index + 1,
+            "total": len(session.tasks),
+        })
         
         return TaskmasterResponse(
             action="execute_next",
@@ -230,38 +356,35 @@ class MarkCompleteHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action="mark_complete", status="guidance", completion_guidance="No active session.")
+            return TaskmasterResponse(action="mark_complete", status="guidance", completion_guidance=_GUIDE_NO_SESSION)
 
         # Mark current task as completed and move to next
-        if session.current_task_index < len(session.tasks):
-            current_task = session.tasks[session.current_task_index]
+        current_task = session.get_current_task()
+        if current_task is not None:
             current_task.status = "completed"
             session.current_task_index += 1
             
             if session.current_task_index >= len(session.tasks):
                 # Update workflow state to completed when all tasks are done
                 session.workflow_state = "workflow_completed"
-                guidance = f"""🎉 ALL TASKS COMPLETED!
-
-📊 FINAL STATUS:
-- Session: {session.name}
-- Tasks completed: {len(session.tasks)}/{len(session.tasks)}
-- Status: Ready to finish
-
-🏁 FINAL STEP: Call 'end_session' to complete the workflow."""
+                guidance = _GUIDE_ALL_TASKS_COMPLETED.format_map({
+                    "session_name": session.name,
+                    "total": len(session.tasks),
+                })
                 next_actions = ["end_session"]
             else:
-                guidance = f"""✅ TASK COMPLETED: {current_task.description}
-
-📊 PROGRESS: {session.current_task_index}/{len(session.tasks)} tasks done
-
-▶️ NEXT STEP: Call 'execute_next' to start the next task."""
+                guidance = _GUIDE_TASK_COMPLETED.format_map({
+                    "description": current_task.description,
+                    "completed": session.current_task_index,
+                    "total": len(session.tasks),
+                })
                 next_actions = ["execute_next"]
         else:
-            guidance = "All tasks completed! Use 'end_session' to finish."
+            guidance = _GUIDE_ALL_TASKS_DONE
             next_actions = ["end_session"]
 
-        await self.session_manager.update_session(session)
+        # Bursts of completions share one debounced write; end_session flushes it
+        self._schedule_update(session)
         
         return TaskmasterResponse(
             action="mark_complete",
@@ -280,37 +403,43 @@ class GetStatusHandler(BaseCommandHandler):
             return TaskmasterResponse(
                 action="get_status",
                 status="no_session",
-                completion_guidance="❌ **No active session.** Use `create_session` to start.",
+                completion_guidance=_GUIDE_STATUS_NO_SESSION,
                 suggested_next_actions=["create_session"]
             )
 
         total_tasks = len(session.tasks)
-        completed_tasks = len([t for t in session.tasks if t.status == "completed"])
-        current_task = next((t for t in session.tasks if t.status == "pending"), None)
+        current_task = session.get_current_task()
         
-        status_info = f"""
-📊 **SESSION STATUS**
-
-**Session ID**: {session.id}
-**Progress**: {completed_tasks}/{total_tasks} tasks completed
-**Current State**: {session.workflow_state}
-
-"""
+        # Render the task lines and count completed tasks in the same pass
+        completed_tasks = 0
+        task_lines = []
+        for i, task in enumerate(session.tasks, 1):
+            if task.status == "completed":
+                completed_tasks += 1
+                task_lines.append(f"{i}. ✅ {task.description}\n")
+            else:
+                task_lines.append(f"{i}. ⏳ {task.description}\n")
+        
+        # Collect the sections and join once instead of growing a string with +=
+        parts = [_GUIDE_STATUS_HEADER.format(
+            session_id=session.id,
+            completed_tasks=completed_tasks,
+            total_tasks=total_tasks,
+            workflow_state=session.workflow_state,
+        )]
         
         if current_task:
-            status_info += f"""**Current Task**: {current_task.description}
-**Status**: {current_task.status}
-
-"""
+            parts.append(_GUIDE_STATUS_CURRENT_TASK.format(
+                description=current_task.description, status=current_task.status
+            ))
         
         if session.tasks:
-            status_info += "**Tasks:**\n"
-            for i, task in enumerate(session.tasks, 1):
-                status = "✅" if task.status == "completed" else "⏳"
-                phase = ""
-                status_info += f"{i}. {status} {task.description}{phase}\n"
+            parts.append("**Tasks:**\n")
+            parts.extend(task_lines)
         else:
-            status_info += "**No tasks created yet.**\n"
+            parts.append("**No tasks created yet.**\n")
+        
+        status_info = "".join(parts)
 
         next_actions = []
         if not session.tasks:
@@ -337,18 +466,10 @@ class CollaborationRequestHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action="collaboration_request", status="guidance", completion_guidance="No active session.")
+            return TaskmasterResponse(action="collaboration_request", status="guidance", completion_guidance=_GUIDE_NO_SESSION)
 
         context = command.collaboration_context or "No context provided."
-        guidance = f"""
-🤝 **WORKFLOW PAUSED FOR USER COLLABORATION**
-
-The agent has requested help with the following context:
-> {context}
-
-**To Resume Workflow**:
-The user must provide feedback. The agent should then use the `edit_task` command to update the plan based on the user's response and then continue with `execute_next`.
-"""
+        guidance = _GUIDE_COLLABORATION.format(context=context)
         return TaskmasterResponse(
             action="collaboration_request",
             session_id=session.id,
@@ -364,7 +485,7 @@ class EditTaskHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action="edit_task", status="guidance", completion_guidance="No active session.")
+            return TaskmasterResponse(action="edit_task", status="guidance", completion_guidance=_GUIDE_NO_SESSION)
 
         task_id = command.task_id
         updated_data = command.updated_task_data
@@ -373,28 +494,12 @@ class EditTaskHandler(BaseCommandHandler):
             return TaskmasterResponse(
                 action="edit_task",
                 status="template",
-                completion_guidance="""
-🛠️ **EDIT TASK**
-
-Update a task based on user feedback or new requirements.
-
-**Example edit_task call:**
-```json
-{
-  "action": "edit_task",
-  "task_id": "task_123",
-  "updated_task_data": {
-    "description": "Updated task description",
-    "complexity_level": "complex"
-  }
-}
-```
-""",
+                completion_guidance=_GUIDE_EDIT_TASK_TEMPLATE,
                 suggested_next_actions=["edit_task"]
             )
 
         # Find and update the task
-        task = next((t for t in session.tasks if t.id == task_id), None)
+        task = session.get_task(task_id)
         if not task:
             return TaskmasterResponse(
                 action="edit_task",
@@ -403,12 +508,13 @@ Update a task based on user feedback or new requirements.
                 suggested_next_actions=["get_status"]
             )
 
-        # Update task fields
+        # Update task fields; only declared model fields are assignable
+        task_fields = Task.model_fields
         for key, value in updated_data.items():
-            if hasattr(task, key):
+            if key in task_fields:
                 setattr(task, key, value)
 
-        await self.session_manager.update_session(session)
+        self._schedule_update(session)
 
         return TaskmasterResponse(
             action="edit_task",
@@ -425,21 +531,20 @@ class EndSessionHandler(BaseCommandHandler):
     async def handle(self, command: TaskmasterCommand) -> TaskmasterResponse:
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action="end_session", status="guidance", completion_guidance="No active session to end.")
+            return TaskmasterResponse(action="end_session", status="guidance", completion_guidance=_GUIDE_NO_SESSION_TO_END)
+
+        # Make sure every scheduled write has landed before reporting the final summary
+        await self.session_manager.flush_pending_updates(session.id)
 
         total_tasks = len(session.tasks)
-        completed_tasks = len([t for t in session.tasks if t.status == "completed"])
+        completed_tasks = sum(1 for t in session.tasks if t.status == "completed")
         
-        guidance = f"""
-🎉 **SESSION COMPLETED**
-
-**Final Summary:**
-- Session ID: {session.id}
-- Tasks Completed: {completed_tasks}/{total_tasks}
-- Session ended at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-**Thank you for using Taskmaster!**
-"""
+        guidance = _GUIDE_END_SESSION.format(
+            session_id=session.id,
+            completed_tasks=completed_tasks,
+            total_tasks=total_tasks,
+            ended_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        )
         
         # Session cleanup would happen here if needed
         
@@ -471,6 +576,14 @@ class TaskmasterCommandHandler:
             "edit_task": EditTaskHandler(session_manager),
             "end_session": EndSessionHandler(session_manager),
         }
+        # Commands for one session run one at a time; different sessions proceed
+        # concurrently. Locks are dropped automatically once no command holds them.
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        
+        # Bound handle methods, so dispatch is a single dict lookup
+        self._dispatch: Dict[str, Callable[[TaskmasterCommand], Awaitable[TaskmasterResponse]]] = {
+            action: handler.handle for action, handler in self.handlers.items()
+        }
         
         # Map actions to workflow events for state machine integration
         self.action_to_event = {
@@ -485,8 +598,8 @@ class TaskmasterCommandHandler:
     
     async def execute(self, command: TaskmasterCommand) -> TaskmasterResponse:
         """Execute a command using the appropriate handler with workflow state enforcement."""
-        handler = self.handlers.get(command.action)
-        if not handler:
+        handle = self._dispatch.get(command.action)
+        if handle is None:
             return TaskmasterResponse(
                 action=command.action,
                 status="guidance",
@@ -495,12 +608,36 @@ class TaskmasterCommandHandler:
 
         # Allow status checks and session creation without a session
         if command.action in ["get_status", "create_session"]:
-            return await handler.handle(command)
+            session = await self.session_manager.get_current_session()
+            if session:
+                self.session_manager.raise_failed_update(session.id)
+            return await handle(command)
 
         session = await self.session_manager.get_current_session()
         if not session:
-            return TaskmasterResponse(action=command.action, status="guidance", completion_guidance="❌ **ERROR**: No active session. Please start with 'create_session'.")
+            return TaskmasterResponse(action=command.action, status="guidance", completion_guidance=_GUIDE_COMMAND_NEEDS_SESSION)
 
+        async with self._get_session_lock(session.id):
+            # Report a background save that failed since the last command; the
+            # session stays dirty, so the next save retries it
+            self.session_manager.raise_failed_update(session.id)
+            return await self._execute_for_session(command, handle, session)
+    
+    def _get_session_lock(self, session_id: str) -> asyncio.Lock:
+        """Get the lock serializing commands for a session, creating it if needed."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+    
+    async def _execute_for_session(
+        self,
+        command: TaskmasterCommand,
+        handle: Callable[[TaskmasterCommand], Awaitable[TaskmasterResponse]],
+        session: Session
+    ) -> TaskmasterResponse:
+        """Apply workflow gating and run the handler; the caller holds the session lock."""
         # --- Enhanced Workflow State Machine Integration ---
         if self.workflow_state_machine:
             # Synchronize workflow state machine with session state
@@ -511,7 +648,7 @@ class TaskmasterCommandHandler:
                 event_name = self._get_execute_next_event(self.workflow_state_machine.current_state, session)
                 if not event_name:
                     # No state transition needed, just execute the handler
-                    return await handler.handle(command)
+                    return await handle(command)
             # Special handling for mark_complete command - context-aware event triggering
             elif command.action == "mark_complete":
                 event_name = self._get_mark_complete_event(session)
@@ -519,14 +656,13 @@ class TaskmasterCommandHandler:
                 event_name = self.action_to_event.get(command.action)
             
             if event_name:
-                from .workflow_state_machine import WorkflowEvent
                 try:
                     event = WorkflowEvent[event_name]
                     
                     # Prepare context data for the workflow state machine
                     context_data = {
                         "task_count": len(session.tasks),
-                        "completed_tasks": len([t for t in session.tasks if t.status == "completed"]),
+                        "completed_tasks": sum(1 for t in session.tasks if t.status == "completed"),
                         "session_id": session.id,
                         **command.data
                     }
@@ -544,20 +680,21 @@ class TaskmasterCommandHandler:
                             suggested_next_actions=possible_events
                         )
                     
-                    # Persist the new state back to session
+                    # Record the new state; it is persisted once after the handler runs
                     session.workflow_state = self.workflow_state_machine.current_state.value
-                    await self.session_manager.update_session(session)
+                    self.session_manager.mark_dirty(session)
                     
                 except (KeyError, ValueError) as e:
                     logger.warning(f"Could not find a corresponding WorkflowEvent for action '{command.action}': {e}")
 
-        # Execute the handler
-        return await handler.handle(command)
+        # Execute the handler, then save the state change unless the handler already did
+        try:
+            return await handle(command)
+        finally:
+            await self.session_manager.flush_dirty(session)
 
     def _get_execute_next_event(self, current_state, session: Session) -> Optional[str]:
         """Get the appropriate event for execute_next based on current workflow state."""
-        from .workflow_state_machine import WorkflowState
-        
         if current_state == WorkflowState.TASKLIST_CREATED:
             return "EXECUTE_TASK"  # Start first task
         elif current_state == WorkflowState.TASK_IN_PROGRESS:
@@ -567,9 +704,8 @@ class TaskmasterCommandHandler:
 
     def _get_mark_complete_event(self, session) -> Optional[str]:
         """Get the appropriate event for mark_complete based on current task phase."""
-        # Find the current task
-        current_task = next((task for task in session.tasks if task.status == "pending"), None)
-        if not current_task:
+        # The current task is tracked by index; no scan needed
+        if session.get_current_task() is None:
             return None  # No current task, let handler deal with it
         
         # For simplified workflow, always trigger COMPLETE_TASK
@@ -581,7 +717,6 @@ class TaskmasterCommandHandler:
             return
             
         try:
-            from .workflow_state_machine import WorkflowState
             current_session_state = WorkflowState(session.workflow_state)
             
             # Only sync if states are different
@@ -591,7 +726,7 @@ class TaskmasterCommandHandler:
                 # Update context with session information
                 self.workflow_state_machine.context.session_id = session.id
                 self.workflow_state_machine.context.task_count = len(session.tasks)
-                self.workflow_state_machine.context.completed_tasks = len([t for t in session.tasks if t.status == "completed"])
+                self.workflow_state_machine.context.completed_tasks = sum(1 for t in session.tasks if t.status == "completed")
                 self.workflow_state_machine.context.metadata["session"] = session
                 
                 logger.info(f"Synchronized workflow state machine to {current_session_state.value}")
@@ -602,6 +737,7 @@ class TaskmasterCommandHandler:
     def add_handler(self, action: str, handler: BaseCommandHandler) -> None:
         """Add a new command handler."""
         self.handlers[action] = handler
+        self._dispatch[action] = handler.handle
     
     def get_available_actions(self) -> List[str]:
         """Get list of available actions."""
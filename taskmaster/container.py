@@ -92,6 +92,8 @@ class TaskmasterContainer(IServiceContainer):
         self._config = config or get_config()
         self._scope_instances: Dict[str, Dict[Type, Any]] = {}
         self._current_scope: Optional[str] = None
+        # Command handlers are registered on first resolution of TaskmasterCommandHandler
+        self._command_handlers_registered = False
         
         # Register core services
         self._register_lightweight_core_services()
@@ -112,7 +114,9 @@ class TaskmasterContainer(IServiceContainer):
                 AsyncSessionPersistence,
                 lambda: AsyncSessionPersistence(
                     storage_directory=Path(self._config.get_state_directory()),
-                    backup_count=self._config.get('session_backup_count', 5)
+                    backup_count=self._config.get('session_backup_count', 5),
+                    compress_backups=self._config.get('session_backup_compression', False),
+                    durable_writes=self._config.get('session_durable_writes', False)
                 ),
                 ServiceLifecycle.SINGLETON
             )
@@ -168,7 +172,7 @@ class TaskmasterContainer(IServiceContainer):
     
     def _ensure_command_handlers_registered(self) -> None:
         """Ensure command handlers are registered when needed."""
-        if hasattr(self, '_command_handlers_registered') and not self._command_handlers_registered:
+        if not self._command_handlers_registered:
             try:
                 self._register_command_handlers()
                 self._command_handlers_registered = True
@@ -298,7 +302,7 @@ class TaskmasterContainer(IServiceContainer):
             ConfigurationError: If the service is not registered
         """
         # Ensure command handlers are registered when resolving TaskmasterCommandHandler
-        if service_type.__name__ == 'TaskmasterCommandHandler':
+        if service_type is TaskmasterCommandHandler and not self._command_handlers_registered:
             self._ensure_command_handlers_registered()
         
         if service_type not in self._services:
@@ -432,6 +436,31 @@ class TaskmasterContainer(IServiceContainer):
             for service_type, registration in self._services.items()
         }
     
+    async def shutdown(self) -> None:
+        """
+        Write pending session saves and await async cleanup, then dispose.
+        
+        Use this from async shutdown paths; dispose() cannot await async hooks.
+        """
+        registration = self._services.get(SessionManager)
+        if registration and registration.instance:
+            try:
+                await registration.instance.close()
+            except Exception as e:
+                logger.error(f"Error writing pending sessions during shutdown: {e}")
+        
+        # Await async dispose hooks here; dispose() below only calls sync ones
+        for registration in self._services.values():
+            dispose = getattr(registration.instance, 'dispose', None)
+            if dispose is not None and inspect.iscoroutinefunction(dispose):
+                try:
+                    await dispose()
+                except Exception as e:
+                    logger.warning(f"Error disposing singleton instance: {e}")
+                registration.instance = None
+        
+        self.dispose()
+    
     def dispose(self) -> None:
         """Dispose of the container and clean up resources."""
         # Dispose of all singleton instances
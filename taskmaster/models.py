@@ -1,7 +1,7 @@
 from __future__ import annotations
 import uuid
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from .workflow_state_machine import WorkflowState
 from datetime import datetime
 
@@ -20,9 +20,49 @@ class Session(BaseModel):
     current_task_index: int = 0
     workflow_state: str = Field(default=WorkflowState.SESSION_CREATED.value)
 
+    # Task ID -> position in tasks; not persisted, rebuilt whenever an entry is stale
+    _task_positions: Dict[str, int] = PrivateAttr(default_factory=dict)
+
     class Config:
         arbitrary_types_allowed = True
 
+    def __eq__(self, other: Any) -> bool:
+        """
+        Compare like BaseModel.__eq__, except for the task position index.
+        
+        _task_positions is a lookup cache rebuilt on demand, so two sessions
+        with the same state compare equal however their index was filled.
+        """
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        if type(self) is not type(other) or self.__dict__ != other.__dict__:
+            return False
+        if self.__pydantic_extra__ != other.__pydantic_extra__:
+            return False
+        return self._private_state() == other._private_state()
+
+    def _private_state(self) -> Dict[str, Any]:
+        """Private attributes that are part of the session's state."""
+        private = self.__pydantic_private__ or {}
+        return {name: value for name, value in private.items() if name != "_task_positions"}
+
+    def get_current_task(self) -> Optional[Task]:
+        """Return the task at current_task_index, or None once every task is done."""
+        if self.current_task_index < len(self.tasks):
+            return self.tasks[self.current_task_index]
+        return None
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Return the task with the given ID, or None if the session has no such task."""
+        position = self._task_positions.get(task_id)
+        if position is not None and position < len(self.tasks) and self.tasks[position].id == task_id:
+            return self.tasks[position]
+
+        # Tasks were replaced, reordered or renamed since the index was built
+        self._task_positions = {task.id: i for i, task in enumerate(self.tasks)}
+        position = self._task_positions.get(task_id)
+        return self.tasks[position] if position is not None else None
+
 
 class TaskmasterData(BaseModel):
     sessions: List[Session] = []
@@ -37,17 +37,27 @@ class WorkflowState(str, Enum):
     PAUSED = "paused"
 
 
+# Action names accepted by the request fast path, built once at import
+_KNOWN_ACTIONS = frozenset(action.value for action in ActionType)
+
+# Workflow state reported when a handler does not supply one. Never handed out
+# directly: create_flexible_response gives each response its own copy.
+_DEFAULT_WORKFLOW_STATE = {
+    "paused": False,
+    "validation_state": "none",
+    "can_progress": True
+}
+
+
 def create_flexible_request(data: Dict[str, Any]) -> Dict[str, Any]:
     """Create an optimized flexible request with batch processing support."""
     # Fast path for valid requests
-    if "action" in data and data["action"] in [
-        "create_session", "create_tasklist", "execute_next", 
-        "mark_complete", "end_session", "get_status", "collaboration_request", "edit_task"
-    ]:
+    action = data.get("action")
+    if isinstance(action, str) and action in _KNOWN_ACTIONS:
         # Optimized defaults for common actions
-        if data["action"] == "create_tasklist":
+        if action == "create_tasklist":
             data.setdefault("tasklist", [])
-        elif data["action"] == "mark_complete":
+        elif action == "mark_complete":
             data.setdefault("evidence", [])
             data.setdefault("description", "")
         
@@ -71,11 +81,10 @@ def create_flexible_response(action: str, **kwargs) -> Dict[str, Any]:
         "status": kwargs.get("status", "success"),
         "completion_guidance": kwargs.get("completion_guidance", ""),
         "next_action_needed": kwargs.get("next_action_needed", True),
-        "workflow_state": kwargs.get("workflow_state", {
-            "paused": False,
-            "validation_state": "none",
-            "can_progress": True
-        })
+        # Copy only on a miss, so a supplied workflow_state costs no extra dict
+        "workflow_state": (
+            kwargs["workflow_state"] if "workflow_state" in kwargs else dict(_DEFAULT_WORKFLOW_STATE)
+        )
     }
     
     # Add any additional fields
@@ -90,10 +99,10 @@ def enhance_capability_data(cap_data: Dict[str, Any], category: str) -> Dict[str
     """Enhance capability data with defaults instead of validation errors."""
     enhanced = cap_data.copy()
     
-    if "name" not in enhanced or not enhanced["name"]:
+    if not enhanced.get("name"):
         enhanced["name"] = f"unnamed_{category}_capability"
     
-    if "description" not in enhanced or not enhanced["description"]:
+    if not enhanced.get("description"):
         enhanced["description"] = f"A {category} capability - please provide a complete description"
     
     # Add category-specific required fields
@@ -114,7 +123,7 @@ def enhance_task_data(task_data: Dict[str, Any]) -> Dict[str, Any]:
     guidance = []
     
     # Ensure description exists
-    if "description" not in enhanced or not enhanced["description"]:
+    if not enhanced.get("description"):
         enhanced["description"] = "Task description needed"
         guidance.append("💡 Consider providing a clear task description")
     
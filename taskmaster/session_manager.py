@@ -1,15 +1,24 @@
 import asyncio
+import functools
 import json
 import os
 import logging
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set, Tuple
 from .models import Session
+from .async_session_persistence import serialize_session, session_content_digest
 from .exceptions import SessionError, ErrorCode
 from .workflow_state_machine import WorkflowEvent
 import aiofiles
 
 logger = logging.getLogger(__name__)
 
+# Window in which repeated schedule_update calls for a session share one write
+UPDATE_DEBOUNCE_SECONDS = 0.05
+
+# Number of sessions whose last saved content digest is remembered
+SAVED_DIGEST_CACHE_SIZE = 256
+
 class SessionManager:
     """
     Production-quality session manager with async support and proper error handling.
@@ -30,6 +39,18 @@ class SessionManager:
         self._lock = asyncio.Lock() # Use async lock for async environment
         self._current_session: Optional[Session] = None
         self._initialized = False
+        # Background saves started by schedule_update that have not finished yet
+        self._pending_updates: Set[asyncio.Task] = set()
+        # Latest session object per ID waiting for its debounced background save
+        self._scheduled_sessions: Dict[str, Session] = {}
+        # Sessions changed in memory but not yet saved or scheduled for saving, by ID
+        self._dirty_sessions: Dict[str, Session] = {}
+        # Errors of background saves not yet reported to a caller, by session ID
+        self._failed_updates: Dict[str, Exception] = {}
+        # Content digest and resulting file signature of the last write per session ID,
+        # to skip unchanged saves; least recently saved entries are dropped beyond
+        # SAVED_DIGEST_CACHE_SIZE
+        self._saved_digests: "OrderedDict[str, Tuple[bytes, Tuple[int, int]]]" = OrderedDict()
         
         # Optional enhanced components
         self.persistence = persistence # AsyncSessionPersistence if available
@@ -71,7 +92,13 @@ class SessionManager:
                 except Exception as e:
                     logger.warning(f"Workflow state machine error during session creation: {e}")
 
-            await self.persistence.save_session(session)
+            session_json = serialize_session(session)
+            await self.persistence.save_session(session, session_json)
+            self._remember_digest(
+                session.id,
+                session_content_digest(session_json),
+                await self.persistence.get_session_file_signature(session.id)
+            )
             await self._update_current_session_reference(session.id)
             self._current_session = session
             logger.info(f"Created new session: {session.id}")
@@ -150,13 +177,22 @@ class SessionManager:
 
         async with self._lock:
             try:
-                await self.persistence.save_session(session)
+                # The save below writes the whole session, including pending changes
+                self._dirty_sessions.pop(session.id, None)
+                # Serialize once: the digest and the file write share these bytes
+                session_json = serialize_session(session)
+                digest = session_content_digest(session_json)
+                if await self._is_saved(session.id, digest):
+                    logger.debug(f"Session unchanged since last save, skipping write: {session.id}")
+                else:
+                    await self.persistence.save_session(session, session_json)
+                    signature = await self.persistence.get_session_file_signature(session.id)
+                    self._remember_digest(session.id, digest, signature)
+                    logger.debug(f"Updated session: {session.id}")
                 
                 if self._current_session and self._current_session.id == session.id:
                     self._current_session = session
                 
-                logger.debug(f"Updated session: {session.id}")
-                
             except Exception as e:
                 raise SessionError(
                     f"Failed to update session: {str(e)}", 
@@ -165,6 +201,111 @@ class SessionManager:
                     cause=e
                 )
     
+    async def _is_saved(self, session_id: str, digest: bytes) -> bool:
+        """Check that the session file still holds the content last written with this digest."""
+        saved = self._saved_digests.get(session_id)
+        if saved is None or saved[0] != digest:
+            return False
+        # A file deleted, restored from backup or edited since our write must be rewritten
+        return saved[1] == await self.persistence.get_session_file_signature(session_id)
+    
+    def _remember_digest(self, session_id: str, digest: bytes, signature: Optional[Tuple[int, int]]) -> None:
+        """Record the digest and file signature of a session's last write, evicting the oldest beyond the cap."""
+        if signature is None:
+            self._saved_digests.pop(session_id, None)
+            return
+        self._saved_digests[session_id] = (digest, signature)
+        self._saved_digests.move_to_end(session_id)
+        if len(self._saved_digests) > SAVED_DIGEST_CACHE_SIZE:
+            self._saved_digests.popitem(last=False)
+    
+    def schedule_update(self, session: Session) -> None:
+        """
+        Persist a session in the background without waiting for the write.
+        
+        Use when the caller's response does not depend on the save being durable;
+        a failed save keeps the session dirty and is raised by the next
+        raise_failed_update() or flush_pending_updates() for that session. Calls for the same session
+        within UPDATE_DEBOUNCE_SECONDS are coalesced into one write of the latest
+        state. Call flush_pending_updates() to wait for outstanding saves.
+        """
+        self._dirty_sessions.pop(session.id, None)
+        already_scheduled = session.id in self._scheduled_sessions
+        self._scheduled_sessions[session.id] = session
+        if already_scheduled:
+            return
+        
+        task = asyncio.create_task(self._debounced_update(session.id))
+        self._pending_updates.add(task)
+        task.add_done_callback(functools.partial(self._on_update_done, session.id))
+    
+    async def _debounced_update(self, session_id: str) -> None:
+        """Wait out the debounce window, then save the latest scheduled session object."""
+        try:
+            await asyncio.sleep(UPDATE_DEBOUNCE_SECONDS)
+        except asyncio.CancelledError:
+            # Cancelled while waiting, e.g. by event loop shutdown: write the
+            # scheduled state now instead of dropping it, then stay cancelled
+            await self._save_scheduled(session_id)
+            raise
+        await self._save_scheduled(session_id)
+    
+    async def _save_scheduled(self, session_id: str) -> None:
+        """Save the scheduled session object, keeping it dirty if the write fails."""
+        # Later schedule_update calls start a new window from here on
+        session = self._scheduled_sessions.pop(session_id)
+        try:
+            await self.update_session(session)
+        except Exception:
+            # The next flush_dirty(), update_session() or close() retries the write
+            self._dirty_sessions[session.id] = session
+            raise
+    
+    def _on_update_done(self, session_id: str, task: asyncio.Task) -> None:
+        """Forget a finished background save and record its failure, if any."""
+        self._pending_updates.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background session update failed: {task.exception()}")
+            self._failed_updates[session_id] = task.exception()
+    
+    def raise_failed_update(self, session_id: str) -> None:
+        """
+        Raise the error of a failed background save of a session, reporting it once.
+        
+        Failures of other sessions stay recorded until their own session asks.
+        """
+        if session_id in self._failed_updates:
+            raise self._failed_updates.pop(session_id)
+    
+    def mark_dirty(self, session: Session) -> None:
+        """Record that a session changed in memory; flush_dirty() saves it later."""
+        self._dirty_sessions[session.id] = session
+    
+    async def flush_dirty(self, session: Session) -> None:
+        """Save a session marked dirty unless a save already covered the change."""
+        if session.id in self._dirty_sessions:
+            await self.update_session(session)
+    
+    async def flush_pending_updates(self, session_id: Optional[str] = None) -> None:
+        """
+        Wait for all background saves started by schedule_update.
+        
+        With a session ID, a failed save of that session is raised afterwards.
+        """
+        if self._pending_updates:
+            await asyncio.gather(*self._pending_updates, return_exceptions=True)
+        if session_id is not None:
+            self.raise_failed_update(session_id)
+    
+    async def close(self) -> None:
+        """Write every scheduled and dirty session; call before shutting down."""
+        if self._pending_updates:
+            await asyncio.gather(*self._pending_updates, return_exceptions=True)
+        # Failed background saves left their sessions dirty, so this retries them
+        for session in list(self._dirty_sessions.values()):
+            await self.update_session(session)
+        self._failed_updates.clear()
+    
     async def end_session(self, session_id: str) -> None:
         """End a session and clear it as current if it's the active one."""
         await self._ensure_initialized()
@@ -172,6 +313,9 @@ class SessionManager:
         if not self.persistence:
             raise SessionError("Async persistence handler not configured", error_code=ErrorCode.CONFIG_NOT_FOUND)
 
+        # Background saves take the lock too, so wait for them before acquiring it
+        await self.flush_pending_updates(session_id)
+
         async with self._lock:
             session = await self.get_session_async(session_id)
             
@@ -190,6 +334,8 @@ class SessionManager:
                 except Exception as e:
                     logger.warning(f"Workflow state machine error during session end: {e}")
             
+            self._saved_digests.pop(session_id, None)
+            
             # Clear current session reference if this is the current session
             if self._current_session and self._current_session.id == session_id:
                 self._current_session = None
@@ -0,0 +1,13 @@
+import pytest
+
+from taskmaster import container as container_module
+from taskmaster.config import Config
+
+
+@pytest.fixture(autouse=True)
+def isolated_state_directory(tmp_path_factory, monkeypatch):
+    """Keep session files written by tests out of the tracked taskmaster/state."""
+    state_dir = tmp_path_factory.mktemp("state")
+    monkeypatch.setattr(Config, "get_state_directory", classmethod(lambda cls: str(state_dir)))
+    monkeypatch.setattr(container_module, "_global_container", None)
+    yield state_dir
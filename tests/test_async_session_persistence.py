@@ -0,0 +1,273 @@
+"""
+Tests for AsyncSessionPersistence file handling.
+
+Covers backup creation and rotation, loading, deletion and the
+listing/statistics helpers against a temporary storage directory.
+"""
+
+import errno
+import gc
+import json
+import os
+
+import pytest
+
+from taskmaster.async_session_persistence import AsyncSessionPersistence, ZSTD_MAGIC
+from taskmaster.models import Session, Task
+
+
+class TestAsyncSessionPersistence:
+    """Test suite for AsyncSessionPersistence."""
+
+    @pytest.fixture
+    def persistence(self, tmp_path):
+        """Create a persistence manager backed by a temporary directory."""
+        return AsyncSessionPersistence(storage_directory=tmp_path, backup_count=3)
+
+    @pytest.mark.asyncio
+    async def test_save_creates_backup_of_previous_version(self, persistence, tmp_path):
+        """Saving an existing session copies the previous file into backup slot 0."""
+        session = Session(name="backup_test")
+        await persistence.save_session(session)
+
+        session.tasks = [Task(description="First task")]
+        await persistence.save_session(session)
+
+        backup = json.loads((tmp_path / f"{session.id}.backup.0.json").read_text())
+        current = json.loads((tmp_path / f"{session.id}.json").read_text())
+        assert backup["tasks"] == []
+        assert current["tasks"][0]["description"] == "First task"
+
+    @pytest.mark.asyncio
+    async def test_backup_rotation_keeps_newest_first(self, persistence, tmp_path):
+        """Backups rotate so slot 0 is the newest and at most backup_count are kept."""
+        session = Session(name="rotation_test")
+        for i in range(5):
+            session.description = f"version {i}"
+            await persistence.save_session(session)
+
+        descriptions = [
+            json.loads((tmp_path / f"{session.id}.backup.{i}.json").read_text())["description"]
+            for i in range(3)
+        ]
+        assert descriptions == ["version 3", "version 2", "version 1"]
+        assert not (tmp_path / f"{session.id}.backup.3.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_compressed_backup_round_trip(self, tmp_path):
+        """Compressed backups are written as zstd frames and still restore the session."""
+        pytest.importorskip("zstandard")
+        persistence = AsyncSessionPersistence(
+            storage_directory=tmp_path, backup_count=3, compress_backups=True
+        )
+        session = Session(name="compressed", tasks=[Task(description="keep me")])
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+
+        backup_file = tmp_path / f"{session.id}.backup.0.json"
+        assert backup_file.read_bytes().startswith(ZSTD_MAGIC)
+
+        (tmp_path / f"{session.id}.json").write_text("{corrupted")
+        loaded = await persistence.load_session(session.id)
+        assert loaded.tasks[0].description == "keep me"
+
+    @pytest.mark.asyncio
+    async def test_durable_writes_fsync_session_file(self, tmp_path, monkeypatch):
+        """With durable_writes enabled every session write is fsynced."""
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+        persistence = AsyncSessionPersistence(
+            storage_directory=tmp_path, backup_count=3, durable_writes=True
+        )
+
+        await persistence.save_session(Session(name="durable"))
+
+        assert len(synced) == 1
+
+    @pytest.mark.asyncio
+    async def test_backup_stops_reflinking_once_unsupported(self, persistence, tmp_path, monkeypatch):
+        """After the filesystem rejects FICLONE, later backups copy without retrying it."""
+        fcntl = pytest.importorskip("fcntl")
+        calls = []
+
+        def reject_clone(fd, request, arg):
+            calls.append(request)
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        monkeypatch.setattr(fcntl, "ioctl", reject_clone)
+        session = Session(name="reflink")
+        for i in range(3):
+            session.description = f"version {i}"
+            await persistence.save_session(session)
+
+        assert len(calls) == 1
+        backup = json.loads((tmp_path / f"{session.id}.backup.0.json").read_text())
+        assert backup["description"] == "version 1"
+
+    def test_session_lock_is_shared_and_released(self, persistence):
+        """The same lock is returned while referenced and dropped afterwards."""
+        lock = persistence._get_session_lock("session_a")
+        assert persistence._get_session_lock("session_a") is lock
+        assert persistence._get_session_lock("session_b") is not lock
+
+        del lock
+        gc.collect()
+        assert "session_a" not in persistence._locks
+
+    @pytest.mark.asyncio
+    async def test_list_sessions_reports_every_session(self, persistence, tmp_path):
+        """list_sessions returns one entry per stored session with its task count."""
+        first = Session(name="first", tasks=[Task(description="a"), Task(description="b")])
+        second = Session(name="second")
+        await persistence.save_session(first)
+        await persistence.save_session(second)
+        # A second save rotates a backup slot, which must not be listed
+        await persistence.save_session(first)
+
+        sessions = {info["id"]: info for info in await persistence.list_sessions()}
+
+        assert set(sessions) == {first.id, second.id}
+        assert sessions[first.id]["task_count"] == 2
+        assert sessions[first.id]["name"] == "first"
+        assert sessions[second.id]["task_count"] == 0
+        assert sessions[first.id]["size"] == (tmp_path / f"{first.id}.json").stat().st_size
+        assert all(info["valid"] for info in sessions.values())
+
+    @pytest.mark.asyncio
+    async def test_list_sessions_marks_schema_invalid_file(self, persistence, tmp_path):
+        """A JSON object that does not validate as a Session is listed as invalid."""
+        (tmp_path / "session_bad.json").write_text(
+            '{"tasks": [{"nodescription": 1}], "current_task_index": "x"}'
+        )
+
+        sessions = await persistence.list_sessions()
+
+        assert sessions == [{
+            "id": "session_bad",
+            "file_path": str(tmp_path / "session_bad.json"),
+            "size": (tmp_path / "session_bad.json").stat().st_size,
+            "modified": (tmp_path / "session_bad.json").stat().st_mtime,
+            "name": None,
+            "task_count": 0,
+            "valid": False
+        }]
+        assert (await persistence.get_storage_stats())["corrupted_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_storage_stats_counts_file_types(self, persistence, tmp_path):
+        """get_storage_stats separates sessions, backups and corrupted files."""
+        session = Session(name="stats")
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+        (tmp_path / "broken.json").write_text("{not json")
+        (tmp_path / f"{session.id}.tmp.json").write_text("{}")
+
+        stats = await persistence.get_storage_stats()
+
+        assert stats["total_sessions"] == 2
+        assert stats["total_backups"] == 1
+        assert stats["total_temp_files"] == 1
+        assert stats["valid_sessions"] == 1
+        assert stats["corrupted_sessions"] == 1
+        assert stats["total_size"] == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+        assert await persistence.cleanup_temp_files() == 1
+        assert not (tmp_path / f"{session.id}.tmp.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_verify_integrity_reuses_parse_until_file_changes(self, persistence, tmp_path):
+        """Unchanged files are served from the parse cache; rewritten files are re-read."""
+        session = Session(name="integrity")
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+
+        result = await persistence.verify_integrity(session.id)
+        assert result["main_file_valid"] is True
+        assert result["valid_backups"] == 1
+        cached_entries = len(persistence._parse_cache)
+
+        await persistence.verify_integrity(session.id)
+        assert len(persistence._parse_cache) == cached_entries
+
+        (tmp_path / f"{session.id}.json").write_text("{corrupted")
+        result = await persistence.verify_integrity(session.id)
+        assert result["main_file_valid"] is False
+
+    @pytest.mark.asyncio
+    async def test_load_falls_back_to_backup(self, persistence, tmp_path):
+        """A corrupted main file is recovered from the newest valid backup."""
+        session = Session(name="recover", tasks=[Task(description="keep me")])
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+        (tmp_path / f"{session.id}.json").write_text("{corrupted")
+
+        loaded = await persistence.load_session(session.id)
+
+        assert loaded is not None
+        assert loaded.tasks[0].description == "keep me"
+
+        # The main file is rewritten in the background
+        await persistence.dispose()
+        restored = json.loads((tmp_path / f"{session.id}.json").read_text())
+        assert restored["tasks"][0]["description"] == "keep me"
+
+    @pytest.mark.asyncio
+    async def test_save_after_recovery_is_not_overwritten_by_restore(self, persistence, tmp_path):
+        """A save issued before the background restore runs supersedes it."""
+        session = Session(name="recover")
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+        (tmp_path / f"{session.id}.json").write_text("{corrupted")
+
+        loaded = await persistence.load_session(session.id)
+        loaded.description = "saved after recovery"
+        await persistence.save_session(loaded)
+        await persistence.dispose()
+
+        current = json.loads((tmp_path / f"{session.id}.json").read_text())
+        assert current["description"] == "saved after recovery"
+
+    @pytest.mark.asyncio
+    async def test_save_and_load_round_trip_non_ascii(self, persistence, tmp_path):
+        """Sessions are written as indented UTF-8 JSON and load back unchanged."""
+        session = Session(name="café ✅", tasks=[Task(description="naïve — task")])
+        await persistence.save_session(session)
+
+        raw = (tmp_path / f"{session.id}.json").read_text(encoding="utf-8")
+        assert json.loads(raw)["name"] == "café ✅"
+        assert raw.startswith("{\n  ")
+
+        loaded = await persistence.load_session(session.id)
+        assert loaded == session
+
+    @pytest.mark.asyncio
+    async def test_load_missing_session_returns_none(self, persistence):
+        """Loading an unknown session id returns None rather than raising."""
+        assert await persistence.load_session("session_missing") is None
+
+    @pytest.mark.asyncio
+    async def test_transaction_saves_only_when_modified(self, persistence, tmp_path):
+        """A read-only transaction leaves the file and its backups untouched."""
+        session = Session(name="transaction")
+        await persistence.save_session(session)
+
+        async with persistence.session_transaction(session.id) as loaded:
+            assert loaded.name == "transaction"
+        assert not (tmp_path / f"{session.id}.backup.0.json").exists()
+
+        async with persistence.session_transaction(session.id) as loaded:
+            loaded.description = "changed"
+        assert (tmp_path / f"{session.id}.backup.0.json").exists()
+        assert (await persistence.load_session(session.id)).description == "changed"
+
+    @pytest.mark.asyncio
+    async def test_delete_session_removes_all_files(self, persistence, tmp_path):
+        """delete_session removes the main file and backups and reports whether anything existed."""
+        session = Session(name="delete")
+        await persistence.save_session(session)
+        await persistence.save_session(session)
+
+        assert await persistence.delete_session(session.id) is True
+        assert list(tmp_path.glob(f"{session.id}*")) == []
+        assert await persistence.delete_session(session.id) is False
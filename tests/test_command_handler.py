@@ -0,0 +1,339 @@
+"""
+Tests for the Taskmaster command handlers.
+
+Runs handlers against a SessionManager backed by a temporary storage
+directory, without a workflow state machine.
+"""
+
+import asyncio
+import errno
+import gc
+import json
+
+import pytest
+from pydantic import PrivateAttr
+
+from taskmaster.async_session_persistence import AsyncSessionPersistence
+from taskmaster.command_handler import TaskmasterCommand, TaskmasterCommandHandler, TaskmasterResponse
+from taskmaster.exceptions import ErrorCode, SessionError
+from taskmaster.models import Session, Task
+from taskmaster.schemas import create_flexible_response
+from taskmaster.session_manager import SessionManager
+from taskmaster.workflow_state_machine import WorkflowStateMachine
+
+
+class TestCommandHandler:
+    """Test suite for TaskmasterCommandHandler and its handlers."""
+
+    @pytest.fixture
+    def session_manager(self, tmp_path):
+        """Create a session manager persisting into a temporary directory."""
+        persistence = AsyncSessionPersistence(storage_directory=tmp_path / "sessions", backup_count=2)
+        return SessionManager(state_dir=str(tmp_path), persistence=persistence)
+
+    @pytest.fixture
+    def handler(self, session_manager):
+        """Create a command handler for the session manager."""
+        return TaskmasterCommandHandler(session_manager)
+
+    @pytest.mark.asyncio
+    async def test_create_tasklist_persists_in_background(self, handler, session_manager):
+        """create_tasklist answers before its save and the save lands once flushed."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="tasks"))
+
+        response = await handler.execute(TaskmasterCommand(
+            action="create_tasklist",
+            tasklist=[{"description": "First"}, {"description": "Second"}]
+        ))
+        assert response.to_dict()["tasks_created"] == 2
+        assert response.tasks_created == 2
+
+        await session_manager.flush_pending_updates()
+        session = await session_manager.get_current_session()
+        stored = await session_manager.persistence.load_session(session.id)
+        assert [task.description for task in stored.tasks] == ["First", "Second"]
+
+    @pytest.mark.asyncio
+    async def test_edit_task_finds_task_by_id(self, handler, session_manager):
+        """edit_task updates the addressed task and reports unknown IDs."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="edit"))
+        await handler.execute(TaskmasterCommand(
+            action="create_tasklist",
+            tasklist=[{"description": "First"}, {"description": "Second"}]
+        ))
+        session = await session_manager.get_current_session()
+        second = session.tasks[1]
+
+        await handler.execute(TaskmasterCommand(
+            action="edit_task",
+            task_id=second.id,
+            updated_task_data={"description": "Renamed", "complexity_level": "complex", "model_dump": None}
+        ))
+        assert session.tasks[1].description == "Renamed"
+
+        response = await handler.execute(TaskmasterCommand(
+            action="edit_task", task_id="task_missing", updated_task_data={"description": "x"}
+        ))
+        assert response.status == "error"
+
+    def test_task_index_does_not_affect_session_equality(self):
+        """Looking a task up by ID leaves the session equal to an untouched copy."""
+        session = Session(name="eq", tasks=[Task(description="First")])
+        copy = session.model_copy(deep=True)
+
+        assert session.get_task(session.tasks[0].id) is session.tasks[0]
+        assert session == copy
+        copy.description = "changed"
+        assert session != copy
+
+    def test_session_equality_checks_type_and_private_state(self):
+        """Sessions still differ by model type and by private attributes other than the index."""
+
+        class TaggedSession(Session):
+            _tag: str = PrivateAttr(default="")
+
+        session = Session(name="eq")
+        tagged = TaggedSession(**session.model_dump())
+        assert session != tagged
+        assert tagged != session
+
+        other = TaggedSession(**session.model_dump())
+        assert tagged == other
+        other._tag = "different"
+        assert tagged != other
+
+    @pytest.mark.asyncio
+    async def test_status_follows_current_task_index(self, handler, session_manager):
+        """get_status reports the task at current_task_index after mark_complete."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="status"))
+        await handler.execute(TaskmasterCommand(
+            action="create_tasklist",
+            tasklist=[{"description": "First"}, {"description": "Second"}]
+        ))
+        await handler.execute(TaskmasterCommand(action="mark_complete"))
+        session = await session_manager.get_current_session()
+
+        status = await handler.execute(TaskmasterCommand(action="get_status"))
+
+        assert status.completed_tasks == 1
+        assert status.current_task_id == session.tasks[1].id
+        assert status.suggested_next_actions == ["execute_next"]
+        assert status.completion_guidance.endswith("**Tasks:**\n1. ✅ First\n2. ⏳ Second\n")
+
+    @pytest.mark.asyncio
+    async def test_execute_next_describes_current_task(self, handler):
+        """execute_next names the current task and its position in the guidance."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="execute"))
+        await handler.execute(TaskmasterCommand(
+            action="create_tasklist",
+            tasklist=[{"description": "First"}, {"description": "Second {with braces}"}]
+        ))
+        await handler.execute(TaskmasterCommand(action="mark_complete"))
+
+        response = await handler.execute(TaskmasterCommand(action="execute_next"))
+
+        assert "CURRENT TASK: Second {with braces}" in response.completion_guidance
+        assert "PROGRESS: Task 2 of 2" in response.completion_guidance
+
+    @pytest.mark.asyncio
+    async def test_workflow_transition_is_saved_once_per_command(self, tmp_path, monkeypatch):
+        """A state transition and the handler's own save collapse into one write."""
+        persistence = AsyncSessionPersistence(storage_directory=tmp_path / "sessions", backup_count=2)
+        session_manager = SessionManager(
+            state_dir=str(tmp_path), persistence=persistence, workflow_state_machine=WorkflowStateMachine()
+        )
+        handler = TaskmasterCommandHandler(session_manager)
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="saves"))
+        await handler.execute(TaskmasterCommand(action="create_tasklist", tasklist=[{"description": "Only"}]))
+        await session_manager.flush_pending_updates()
+
+        saves = []
+        real_save = persistence.save_session
+        monkeypatch.setattr(persistence, "save_session", lambda s, *args: saves.append(s.workflow_state) or real_save(s, *args))
+
+        await handler.execute(TaskmasterCommand(action="execute_next"))
+        assert len(saves) == 1
+
+        await handler.execute(TaskmasterCommand(action="mark_complete"))
+        await session_manager.flush_pending_updates()
+        assert len(saves) == 2
+
+        stored = await persistence.load_session((await session_manager.get_current_session()).id)
+        assert stored.workflow_state == saves[-1]
+
+    def test_session_lock_is_shared_and_released(self, handler):
+        """Commands for one session share a lock that is dropped once unused."""
+        lock = handler._get_session_lock("session_a")
+        assert handler._get_session_lock("session_a") is lock
+        assert handler._get_session_lock("session_b") is not lock
+
+        del lock
+        gc.collect()
+        assert "session_a" not in handler._session_locks
+
+    def test_default_workflow_state_is_not_shared_in_output(self):
+        """Mutating one response's workflow_state output does not leak into others."""
+        first = TaskmasterResponse(action="get_status").to_dict()
+        first["workflow_state"]["paused"] = True
+
+        second = TaskmasterResponse(action="get_status").to_dict()
+        assert second["workflow_state"] == {"paused": False, "validation_state": "none", "can_progress": True}
+
+        # Raw payloads (server error path, BaseResponse, response.data) get their own copy too
+        raw = create_flexible_response("error")
+        raw["workflow_state"]["paused"] = True
+        assert create_flexible_response("error")["workflow_state"]["paused"] is False
+
+    @pytest.mark.asyncio
+    async def test_end_session_flushes_scheduled_saves(self, handler, session_manager):
+        """Completions are saved in the background and end_session waits for them."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="flush"))
+        await handler.execute(TaskmasterCommand(
+            action="create_tasklist",
+            tasklist=[{"description": "First"}, {"description": "Second"}]
+        ))
+        await handler.execute(TaskmasterCommand(action="mark_complete"))
+        await handler.execute(TaskmasterCommand(action="mark_complete"))
+
+        response = await handler.execute(TaskmasterCommand(action="end_session"))
+
+        assert response.completed_tasks == 2
+        session = await session_manager.get_current_session()
+        stored = await session_manager.persistence.load_session(session.id)
+        assert [task.status for task in stored.tasks] == ["completed", "completed"]
+        assert stored.workflow_state == "workflow_completed"
+
+    @pytest.mark.asyncio
+    async def test_scheduled_updates_are_coalesced(self, session_manager, monkeypatch):
+        """Repeated schedule_update calls in one window write the session once."""
+        session = await session_manager.create_session("debounce")
+        saves = []
+        real_save = session_manager.persistence.save_session
+        monkeypatch.setattr(
+            session_manager.persistence, "save_session", lambda s, *args: saves.append(s.description) or real_save(s, *args)
+        )
+
+        for i in range(5):
+            session.description = f"edit {i}"
+            session_manager.schedule_update(session)
+        await session_manager.flush_pending_updates()
+
+        assert saves == ["edit 4"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_session_is_not_rewritten(self, session_manager, monkeypatch):
+        """update_session skips the write when the session matches the last save."""
+        session = await session_manager.create_session("unchanged")
+        saves = []
+        real_save = session_manager.persistence.save_session
+        monkeypatch.setattr(
+            session_manager.persistence, "save_session", lambda s, *args: saves.append(s.description) or real_save(s, *args)
+        )
+
+        await session_manager.update_session(session)
+        assert saves == []
+
+        session.description = "changed"
+        await session_manager.update_session(session)
+        await session_manager.update_session(session)
+        assert saves == ["changed"]
+
+    @pytest.mark.asyncio
+    async def test_saved_digests_are_bounded(self, session_manager, monkeypatch):
+        """Only the most recently saved sessions keep a digest for change detection."""
+        monkeypatch.setattr("taskmaster.session_manager.SAVED_DIGEST_CACHE_SIZE", 2)
+        sessions = [await session_manager.create_session(f"s{i}") for i in range(3)]
+
+        assert list(session_manager._saved_digests) == [s.id for s in sessions[1:]]
+
+    def test_scheduled_saves_survive_event_loop_shutdown(self, tmp_path):
+        """Saves still waiting out the debounce window are written when the loop is torn down."""
+        persistence = AsyncSessionPersistence(storage_directory=tmp_path / "sessions", backup_count=2)
+        session_manager = SessionManager(state_dir=str(tmp_path), persistence=persistence)
+        handler = TaskmasterCommandHandler(session_manager)
+
+        async def run_commands():
+            await handler.execute(TaskmasterCommand(action="create_session", session_name="shutdown"))
+            await handler.execute(TaskmasterCommand(action="create_tasklist", tasklist=[{"description": "Only"}]))
+            await handler.execute(TaskmasterCommand(action="mark_complete"))
+            return session_manager._current_session.id
+
+        # asyncio.run cancels the pending debounced save on exit
+        session_id = asyncio.run(run_commands())
+
+        stored = json.loads((tmp_path / "sessions" / f"{session_id}.json").read_text())
+        assert [task["status"] for task in stored["tasks"]] == ["completed"]
+
+    @pytest.mark.asyncio
+    async def test_close_writes_dirty_sessions(self, session_manager):
+        """close() saves sessions that were marked dirty but never flushed."""
+        session = await session_manager.create_session("close")
+        session.description = "unsaved"
+        session_manager.mark_dirty(session)
+
+        await session_manager.close()
+
+        assert (await session_manager.persistence.load_session(session.id)).description == "unsaved"
+
+    @pytest.mark.asyncio
+    async def test_failed_background_save_is_raised_and_retried(self, handler, session_manager, monkeypatch):
+        """A failed background save fails the next command, and a later save writes the changes."""
+        await handler.execute(TaskmasterCommand(action="create_session", session_name="enospc"))
+        real_save = session_manager.persistence.save_session
+
+        async def disk_full(session, *args):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(session_manager.persistence, "save_session", disk_full)
+        response = await handler.execute(TaskmasterCommand(
+            action="create_tasklist", tasklist=[{"description": "Only"}]
+        ))
+        assert response.status == "success"
+        # Let the background save run and fail without consuming its error
+        await asyncio.gather(*session_manager._pending_updates, return_exceptions=True)
+
+        with pytest.raises(SessionError) as excinfo:
+            await handler.execute(TaskmasterCommand(action="execute_next"))
+        assert excinfo.value.error_code == ErrorCode.SESSION_PERSISTENCE_FAILED
+
+        monkeypatch.setattr(session_manager.persistence, "save_session", real_save)
+        await handler.execute(TaskmasterCommand(action="execute_next"))
+        session = await session_manager.get_current_session()
+        stored = await session_manager.persistence.load_session(session.id)
+        assert [task.description for task in stored.tasks] == ["Only"]
+
+    @pytest.mark.asyncio
+    async def test_failed_save_is_reported_only_to_its_session(self, handler, session_manager, monkeypatch):
+        """A failed background save of one session does not fail commands of another."""
+        failing = await session_manager.create_session("failing")
+        current = await session_manager.create_session("current")
+        real_save = session_manager.persistence.save_session
+
+        async def fail_one(session, *args):
+            if session.id == failing.id:
+                raise OSError(errno.ENOSPC, "No space left on device")
+            return await real_save(session, *args)
+
+        monkeypatch.setattr(session_manager.persistence, "save_session", fail_one)
+        failing.description = "lost"
+        current.description = "kept"
+        session_manager.schedule_update(failing)
+        session_manager.schedule_update(current)
+        await session_manager.flush_pending_updates(current.id)
+
+        assert (await handler.execute(TaskmasterCommand(action="get_status"))).status != "error"
+        await handler.execute(TaskmasterCommand(action="end_session"))
+
+        with pytest.raises(SessionError) as excinfo:
+            await session_manager.flush_pending_updates(failing.id)
+        assert excinfo.value.error_code == ErrorCode.SESSION_PERSISTENCE_FAILED
+
+    @pytest.mark.asyncio
+    async def test_unchanged_session_is_rewritten_after_file_is_removed(self, session_manager):
+        """A matching digest does not skip the save once the session file is gone."""
+        session = await session_manager.create_session("deleted")
+        await session_manager.persistence.delete_session(session.id)
+
+        await session_manager.update_session(session)
+
+        assert (await session_manager.persistence.load_session(session.id)).name == "deleted"